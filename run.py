@@ -12,7 +12,8 @@ from uniprot_pipeline.pipeline import run_pipeline
 @click.option('--size', default=500, show_default=True, help="Number of entries per API request")
 @click.option('--file-format', default="jsonl", type=click.Choice(['json', 'jsonl']), show_default=True, help="Output format")
 @click.option('--query', default="organism_id:9606 AND reviewed:true", help="UniProt query string")
-def main(mode, from_date, to_date, output_json, output_jsonl, base, exclude_sequence, size, file_format, query):
+@click.option('--workers', default=1, show_default=True, help="Worker processes for flattening (1 = no pool)")
+def main(mode, from_date, to_date, output_json, output_jsonl, base, exclude_sequence, size, file_format, query, workers):
     """
     CLI entry point for running the UniProt data pipeline.
     """
@@ -26,7 +27,8 @@ def main(mode, from_date, to_date, output_json, output_jsonl, base, exclude_sequ
         exclude_sequence=exclude_sequence,
         size=size,
         file_format=file_format,
-        query=query
+        query=query,
+        workers=workers
     )
 
 if __name__ == '__main__':
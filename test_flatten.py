@@ -0,0 +1,65 @@
+import pytest
+from uniprot_pipeline.flatten import flatten_json, flatten_specialize, SchemaMismatch
+
+
+def test_flatten_nested_dict():
+    entry = {"a": {"b": {"c": 1}}, "d": 2}
+    flat = flatten_json(entry)
+    assert flat == {"a.b.c": 1, "d": 2}
+
+
+def test_flatten_list_of_dicts_uses_indices():
+    entry = {"genes": [{"name": "TP53"}, {"name": "MDM2"}]}
+    flat = flatten_json(entry)
+    assert flat == {"genes.0.name": "TP53", "genes.1.name": "MDM2"}
+
+
+def test_non_dict_list_preserved_as_is():
+    entry = {"keywords": ["a", "b"], "mixed": [{"x": 1}, 2]}
+    flat = flatten_json(entry)
+    assert flat["keywords"] == ["a", "b"]
+    assert flat["mixed"] == [{"x": 1}, 2]
+
+
+def test_max_depth_stops_flattening():
+    entry = {"a": {"b": {"c": 1}}}
+    flat = flatten_json(entry, max_depth=2)
+    assert flat == {"a.b": {"c": 1}}
+
+
+def test_include_and_exclude_keys():
+    entry = {"keep": {"x": 1}, "drop": {"y": 2}}
+    assert flatten_json(entry, include_keys={"keep"}) == {"keep.x": 1}
+    assert flatten_json(entry, exclude_keys={"drop"}) == {"keep.x": 1}
+
+
+def test_exclude_paths_skips_subtree():
+    entry = {"sequence": {"value": "MKV", "length": 3}, "a": 1}
+    flat = flatten_json(entry, exclude_paths={"sequence.value"})
+    assert flat == {"sequence.length": 3, "a": 1}
+
+
+def test_prefix_applied_to_all_keys():
+    flat = flatten_json({"a": 1}, prefix="root")
+    assert flat == {"root.a": 1}
+
+
+def test_specialized_matches_generic_on_same_shape():
+    sample = {"acc": "P1", "audit": {"date": "2024-01-01"},
+              "genes": [{"name": "A"}], "kw": ["x"]}
+    fast = flatten_specialize(sample)
+    assert fast(sample) == flatten_json(sample)
+    other = {"acc": "P2", "audit": {"date": "2023-05-01"},
+             "genes": [{"name": "B"}], "kw": ["y", "z"]}
+    assert fast(other) == flatten_json(other)
+
+
+def test_specialized_raises_on_shape_drift():
+    sample = {"acc": "P1", "genes": [{"name": "A"}]}
+    fast = flatten_specialize(sample)
+    with pytest.raises(SchemaMismatch):
+        fast({"acc": "P1"})  # missing key
+    with pytest.raises(SchemaMismatch):
+        fast({"acc": "P1", "genes": [{"name": "A"}, {"name": "B"}]})  # longer list
+    with pytest.raises(SchemaMismatch):
+        fast({"acc": {"nested": 1}, "genes": [{"name": "A"}]})  # leaf became dict
@@ -1,8 +1,140 @@
 import os
 import requests
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from typing import Optional, List
-from .flatten import flatten_json 
+from .flatten import flatten_json, flatten_specialize, SchemaMismatch
+
+# orjson is much faster than stdlib json on large UniProt payloads; fall back
+# to stdlib json when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pysimdjson wraps the simdjson kernel (runtime-dispatched AVX2/NEON) and
+# parses the multi-MB UniProt page bodies at multiple GB/s; optional, with
+# orjson and then stdlib json as fallbacks.
+try:
+    import simdjson
+    _SIMDJSON_PARSER = simdjson.Parser()
+except ImportError:
+    _SIMDJSON_PARSER = None
+
+
+def _parse_page(content: bytes) -> list:
+    """Parse one API page body and return its 'results' entries."""
+    if _SIMDJSON_PARSER is not None:
+        doc = _SIMDJSON_PARSER.parse(content)
+        try:
+            results = doc["results"]
+        except KeyError:
+            return []
+        # Materialize before the parser buffer is reused for the next page
+        return results.as_list()
+    if orjson is not None:
+        # Parse the raw bytes directly, avoiding a full str decode
+        return orjson.loads(content).get("results", [])
+    return json.loads(content).get("results", [])
+
+
+# Directories already created this run; skips repeated makedirs stat calls
+# when several outputs share the same target directory
+_MKDIR_CACHE = set()
+
+
+def _ensure_dir(filepath):
+    """Create the parent directory of filepath once per process."""
+    dirname = os.path.dirname(filepath)
+    if dirname and dirname not in _MKDIR_CACHE:
+        os.makedirs(dirname, exist_ok=True)
+        _MKDIR_CACHE.add(dirname)
+
+
+# Dotted paths pruned during flattening when exclude_sequence is set
+_SEQUENCE_PATHS = {"sequence.value"}
+
+# Below this page size the generic flatten is used directly; compiling a
+# schema specializer would not pay for itself
+_SPECIALIZE_MIN_RECORDS = 32
+
+
+def _flatten_specialized(records, fast, generic):
+    """Flatten records with a compiled specializer, falling back per entry."""
+    for entry in records:
+        try:
+            yield fast(entry)
+        except SchemaMismatch:
+            yield generic(entry)
+
+
+def _flatten_entry(entry, max_depth=None, include_keys=None, exclude_sequence=False):
+    """Flatten one raw entry, pruning sequence fields during the walk.
+
+    Module-level so it can be pickled into worker processes.
+    """
+    return flatten_json(entry, max_depth=max_depth, include_keys=include_keys,
+                        exclude_paths=_SEQUENCE_PATHS if exclude_sequence else None)
+
+# Helper to save JSON
+def save_json(filepath, content):
+    if filepath:
+        try:
+            _ensure_dir(filepath)
+            if orjson is not None:
+                with open(filepath, "wb") as f:
+                    f.write(orjson.dumps(content, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filepath, "w") as f:
+                    json.dump(content, f, indent=2)
+            print(f"Saved JSON to: {os.path.abspath(filepath)}")
+        except Exception as e:
+            print(f"Failed to save JSON: {e}")
+
+
+# Helper to save JSONL
+def save_jsonl(filepath, content):
+    if filepath:
+        try:
+            _ensure_dir(filepath)
+            # Serialize lazily and let a 1 MiB buffer coalesce the writes,
+            # avoiding both per-row write() calls and one giant join
+            with open(filepath, "wb", buffering=1 << 20) as f:
+                if orjson is not None:
+                    f.writelines(orjson.dumps(row) + b"\n" for row in content)
+                else:
+                    f.writelines(json.dumps(row).encode() + b"\n" for row in content)
+            print(f"Saved JSONL to: {os.path.abspath(filepath)}")
+        except Exception as e:
+            print(f"Failed to save JSONL: {e}")
+
+
+def save_jsonl_fast(filepath: str, records: List[dict]):
+    """
+    Write uniform flat records as JSONL through the pandas C encoder.
+
+    Feeds the whole list into DataFrame.to_json(lines=True), which
+    serializes in a single C-level pass with one big write instead of one
+    Python dict at a time. Only suitable for schema-stable flat records:
+    the DataFrame unions the columns, so rows missing a key are written
+    with an explicit null rather than omitting it. Falls back to the
+    per-row writer when pandas is not installed.
+
+    Args:
+        filepath (str): Path to save the JSONL file.
+        records: Flat records sharing one column set.
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        save_jsonl(filepath, records)
+        return
+    _ensure_dir(filepath)
+    pd.DataFrame(records).to_json(filepath, orient="records", lines=True,
+                                  force_ascii=False)
+    print(f"Saved JSONL to: {os.path.abspath(filepath)}")
+
 
 def uniprot_data(
     query: str,
@@ -15,13 +147,19 @@ def uniprot_data(
     exclude_sequence: bool = False,
     include_keys: Optional[set] = None,
     max_depth: Optional[int] = None,
+    workers: Optional[int] = None,
 ) -> Optional[List[dict]]:
     """
     Fetch data from the UniProt REST API and save it in raw and optionally flattened formats.
 
+    Pages are fetched one at a time through UniProt's Link-header cursor
+    pagination, so memory stays proportional to one page rather than the
+    whole corpus, and flattened rows are written to the JSONL file as each
+    page arrives.
+
     Args:
         query (str): The UniProt query string.
-        output_json_path (str): Path to save the raw JSON response.
+        output_json_path (str): Path to save the raw API pages (one JSON page per line).
         flat_json_path: Path to save the flattened JSON array.
         flat_jsonl_path: Path to save the flattened JSONL file.
         raw_jsonl_path: Path to save the original (raw) entries in JSONL format.
@@ -30,9 +168,12 @@ def uniprot_data(
         exclude_sequence (bool): Whether to exclude the protein sequence field.
         include_keys: Only flatten keys included in this set.
         max_depth: Maximum depth for flattening.
+        workers: Number of processes for flattening. None or 1 keeps it
+            serial; use more on large pages where pool startup is amortized.
 
     Returns:
-        list[dict] or None: Flattened data if successful, otherwise None.
+        (list[dict], headers) or None: Flattened data and the first page's
+        response headers if successful, otherwise None.
     """
 
     url = "https://rest.uniprot.org/uniprotkb/search"
@@ -40,84 +181,134 @@ def uniprot_data(
     print(f"[Requesting] {url}")
     print(f"[Params] {params}")
 
-    # Perform the API request
-    try:
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"Request failed: {e}")
-        return None
+    # Convert include_keys to set for fast lookup
+    if include_keys and isinstance(include_keys, list):
+        include_keys = set(include_keys)
 
-    # Save the raw JSON response to file
+    # Reuse one connection across pages and ask for compressed bodies
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = "gzip"
+
+    # Open the flattened JSONL output up front so pages can be appended as
+    # they arrive (1 MiB buffer to amortize small writes)
+    flat_writer = None
+    raw_page_writer = None
+    if flat_jsonl_path:
+        _ensure_dir(flat_jsonl_path)
+        flat_writer = open(flat_jsonl_path, "wb", buffering=1 << 20)
     if output_json_path:
-        output_dir = os.path.dirname(output_json_path)
-        if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
-        try:
-            with open(output_json_path, "w") as f:
-                f.write(response.text)
-            print(f"Raw JSON saved to: {os.path.abspath(output_json_path)}")
-        except Exception as e:
-            print(f"Failed to save raw JSON: {e}")
-            return None
+        _ensure_dir(output_json_path)
+        raw_page_writer = open(output_json_path, "wb", buffering=1 << 20)
 
-    # Parse JSON data
-    try:
-        json_data = response.json()
-        records = json_data.get("results", [])
-    except Exception as e:
-        print(f"Failed to parse JSON: {e}")
-        return None
+    flattened = []
+    records = []
+    headers = None
+    page = 0
+    # Bound once; the total is unknown until pagination ends, so the list
+    # cannot be pre-sized, but this drops the LOAD_ATTR per row
+    append_row = flattened.append
 
-    if not records:
-        print("No records found in the API response.")
-        return None
+    # Flattening is data-parallel over independent entries; spin up a pool
+    # only when requested so small fetches do not pay process startup
+    flatten_entry = partial(_flatten_entry, max_depth=max_depth,
+                            include_keys=include_keys,
+                            exclude_sequence=exclude_sequence)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
 
-    # Convert include_keys to set for fast lookup
-    if include_keys and isinstance(include_keys, list):
-        include_keys = set(include_keys)
+    # One background thread prefetches the next page while the current one
+    # is being flattened, so network RTT and CPU work overlap. Pagination is
+    # sequential by design (the next URL comes from the current response's
+    # Link header), so a single prefetch slot is all the lookahead possible.
+    fetcher = ThreadPoolExecutor(max_workers=1)
+    next_page = fetcher.submit(session.get, url, params=params, timeout=30)
 
-    # Flatten each record
-    flattened = []
-    for entry in records:
-        row = flatten_json(entry, max_depth=max_depth, include_keys=include_keys)
-        if exclude_sequence:
-            # Filter out sequence fields if requested
-            row = {k: v for k, v in row.items() if not k.startswith("sequence.value")}
-        flattened.append(row)
-
-    # Helper to save JSON 
-    def save_json(filepath, content):
-        if filepath:
+    try:
+        while next_page is not None:
+            # Collect the (pre)fetched page
             try:
-                out_dir = os.path.dirname(filepath)
-                if out_dir:
-                    os.makedirs(out_dir, exist_ok=True)
-                with open(filepath, "w") as f:
-                    json.dump(content, f, indent=2)
-                print(f"Saved JSON to: {os.path.abspath(filepath)}")
-            except Exception as e:
-                print(f"Failed to save JSON: {e}")
+                response = next_page.result()
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                print(f"Request failed: {e}")
+                if page == 0:
+                    return None
+                print(f"Stopping pagination after {page} page(s).")
+                break
+
+            # Kick off the next fetch before doing any CPU work on this page
+            next_url = response.links.get("next", {}).get("url")
+            next_page = fetcher.submit(session.get, next_url, timeout=30) if next_url else None
+
+            if headers is None:
+                headers = response.headers
+
+            # Raw bytes, fetched once; .text would re-decode the whole body
+            # into a second giant str
+            content = response.content
 
-    # Helper to save JSONL 
-    def save_jsonl(filepath, content):
-        if filepath:
+            # Append the raw page body as one ndjson line without copying it
+            if raw_page_writer is not None:
+                raw_page_writer.write(content)
+                if not content.endswith(b"\n"):
+                    raw_page_writer.write(b"\n")
+
+            # Parse the page
             try:
-                out_dir = os.path.dirname(filepath)
-                if out_dir:
-                    os.makedirs(out_dir, exist_ok=True)
-                with open(filepath, "w") as f:
-                    for row in content:
-                        f.write(json.dumps(row) + "\n")
-                print(f"Saved JSONL to: {os.path.abspath(filepath)}")
+                page_records = _parse_page(content)
             except Exception as e:
-                print(f"Failed to save JSONL: {e}")
+                print(f"Failed to parse JSON: {e}")
+                return None
+
+            # Flatten each record and stream it out immediately
+            if pool is not None:
+                page_rows = pool.map(flatten_entry, page_records, chunksize=64)
+            elif (max_depth is None and len(page_records) >= _SPECIALIZE_MIN_RECORDS
+                    and type(page_records[0]) is dict):
+                # Compile a straight-line flattener for this page's shape;
+                # entries that drift from it fall back to the generic walk
+                fast = flatten_specialize(
+                    page_records[0], include_keys=include_keys,
+                    exclude_paths=_SEQUENCE_PATHS if exclude_sequence else None)
+                page_rows = _flatten_specialized(page_records, fast, flatten_entry)
+            else:
+                page_rows = map(flatten_entry, page_records)
+            if flat_writer is None:
+                # No interleaved writes needed: drain the page in one call
+                flattened.extend(page_rows)
+            else:
+                for row in page_rows:
+                    if orjson is not None:
+                        flat_writer.write(orjson.dumps(row) + b"\n")
+                    else:
+                        flat_writer.write(json.dumps(row).encode() + b"\n")
+                    append_row(row)
+
+            if flat_json_path or raw_jsonl_path:
+                records.extend(page_records)
+
+            page += 1
+            print(f"[Page {page}] {len(page_records)} entries ({len(flattened)} total)")
+    finally:
+        fetcher.shutdown()
+        if pool is not None:
+            pool.shutdown()
+        if flat_writer is not None:
+            flat_writer.close()
+        if raw_page_writer is not None:
+            raw_page_writer.close()
+            print(f"Raw JSON pages saved to: {os.path.abspath(output_json_path)}")
+
+    if not flattened:
+        print("No records found in the API response.")
+        return None
+
+    if flat_jsonl_path:
+        print(f"Saved JSONL to: {os.path.abspath(flat_jsonl_path)}")
 
-    # Save processed outputs
+    # Save processed outputs (the flattened JSONL was already streamed above)
     save_json(flat_json_path, flattened)
-    save_jsonl(flat_jsonl_path, flattened)
     save_jsonl(raw_jsonl_path, records)
-    return flattened, response.headers
+    return flattened, headers
 
 
 # Standalone usage for local testing
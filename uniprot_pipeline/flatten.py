@@ -1,13 +1,46 @@
+"""
+Flattening of nested UniProt JSON entries.
+
+The hot path is deliberately a pure-Python iterative walk. A Numba-JIT
+variant over typed containers was evaluated and rejected: UniProt entries
+are heterogeneous trees (dict values mix strings, numbers, lists, and
+nested dicts per key), which numba.typed.Dict cannot represent since it
+requires a single concrete value type. Dispatch overhead is instead kept
+down by the explicit stack, type identity checks, and one-shot key joins
+below.
+"""
+
+import sys
+
+# Bound once at module level to skip the attribute lookup per leaf
+_JOIN = ".".join
+
+
+class SchemaMismatch(Exception):
+    """Raised by a specialized flattener when an entry's shape differs
+    from the sample it was compiled for. Callers should fall back to the
+    generic flatten_json."""
+
+
+# Compiled specializers keyed by their generated source, so repeated pages
+# with the same shape reuse one exec()'d function
+_SPECIALIZER_CACHE = {}
+
+
 def flatten_json(
     y: dict,
     prefix: str = '',
     max_depth: int = None,
     include_keys: set = None,
-    exclude_keys: set = None
+    exclude_keys: set = None,
+    exclude_paths: set = None
 ) -> dict:
     """
-    Recursively flattens a nested JSON object (dicts and lists) into a flat dictionary.
-    
+    Flattens a nested JSON object (dicts and lists) into a flat dictionary.
+
+    Uses an explicit stack instead of recursion, so deep UniProt entries do
+    not pay a Python function call per nested node.
+
     Optionally supports:
     - Max depth flattening
     - Including only specific top-level keys
@@ -15,54 +48,174 @@ def flatten_json(
 
     Args:
         y (dict): The input JSON object to flatten.
-        prefix (str): Prefix for keys (used in recursion, leave blank when calling).
+        prefix (str): Prefix for keys (leave blank when calling).
         max_depth: Maximum depth to flatten. If None, flattens fully.
         include_keys: Top-level keys to include. If set, only these keys are processed.
         exclude_keys: Top-level keys to exclude.
+        exclude_paths: Full dotted key paths (e.g. "sequence.value") to skip
+            without descending into or storing their values.
 
     Returns:
         dict: A flattened version of the input dictionary.
     """
+    # Prune top-level keys up front so the loop has no per-node filter checks
+    if (include_keys is not None or exclude_keys is not None) and type(y) is dict:
+        y = {
+            k: v for k, v in y.items()
+            if (include_keys is None or k in include_keys)
+            and (exclude_keys is None or k not in exclude_keys)
+        }
+
     out = {}
+    base_path = tuple(prefix.split(".")) if prefix else ()
+
+    # UniProt keys come from a small fixed vocabulary, so interning the path
+    # components lets every record share the same component strings
+    join = _JOIN
+    intern = sys.intern
+
+    # Depth-first walk over (value, key path, depth) tuples; children are
+    # pushed in reverse so output key order matches the recursive version
+    stack = [(y, base_path, 0)]
+    while stack:
+        x, path, depth = stack.pop()
 
-    def flatten(x, name="", depth=0):
-        """Recursive helper to flatten dicts and lists."""
-        # Handle inclusion/exclusion at top-level keys (depth == 0)
-        if depth == 0:
-            top_key = name.partition(".")[0] if "." in name else name
-            if include_keys is not None and top_key not in include_keys:
-                return
-            if exclude_keys is not None and top_key in exclude_keys:
-                return
-
-        # Stop recursion if depth limit is reached
+        # Drop excluded paths before any flattening work happens on them
+        if exclude_paths is not None and path and join(path) in exclude_paths:
+            continue
+
+        # Stop descending once the depth limit is reached
         if max_depth is not None and depth >= max_depth:
-            out[name] = x
-            return
+            out[join(path)] = x
+            continue
 
-        # Recursive flattening logic
-        if isinstance(x, dict):
-            for k, v in x.items():
-                full_key = f"{name}.{k}" if name else k
-                flatten(v, full_key, depth + 1)
+        if type(x) is dict:
+            for k, v in reversed(x.items()):
+                stack.append((v, path + (intern(k),), depth + 1))
 
-        elif isinstance(x, list):
-            if all(isinstance(i, dict) for i in x):
+        elif type(x) is list:
+            # Single pass that bails out on the first non-dict element
+            all_dicts = True
+            for item in x:
+                if type(item) is not dict:
+                    all_dicts = False
+                    break
+            if all_dicts:
                 # Flatten each dict in list with index
-                for idx, item in enumerate(x):
-                    full_key = f"{name}.{idx}" if name else str(idx)
-                    flatten(item, full_key, depth + 1)
+                for idx in range(len(x) - 1, -1, -1):
+                    stack.append((x[idx], path + (intern(str(idx)),), depth + 1))
             else:
                 # Preserve non-dict lists as-is
-                out[name] = x
+                out[join(path)] = x
 
         else:
             # Primitive value
-            out[name] = x
+            out[join(path)] = x
 
-    flatten(y, prefix, depth=0)
     return out
 
-import json
+def _check_leaf(v):
+    """Pass a primitive leaf through, rejecting containers."""
+    if v.__class__ is dict or v.__class__ is list:
+        raise SchemaMismatch
+    return v
+
+
+def _check_plain_list(v):
+    """Pass a non-empty, non-dict list through, rejecting anything else.
+
+    Empty lists are rejected because the generic flatten drops them
+    entirely, so they must go through the fallback path.
+    """
+    if v.__class__ is not list or not v:
+        raise SchemaMismatch
+    for item in v:
+        if item.__class__ is dict:
+            raise SchemaMismatch
+    return v
+
+
+def flatten_specialize(sample: dict, include_keys: set = None,
+                       exclude_paths: set = None):
+    """
+    Compile a flattener specialized to the exact shape of one sample entry.
+
+    Walks the sample once to enumerate its leaf paths and emits
+    straight-line ``out['a.b.c'] = e['a']['b']['c']`` assignments with
+    length guards on every dict and list, so matching entries are
+    flattened with no recursion or type dispatch at all. The generated
+    function raises SchemaMismatch on any entry whose shape differs from
+    the sample; callers fall back to flatten_json for those.
+
+    Args:
+        sample (dict): A representative entry; its shape defines the code.
+        include_keys: Top-level keys to include, as in flatten_json.
+        exclude_paths: Dotted key paths to skip, as in flatten_json.
+
+    Returns:
+        callable: dict -> flat dict, raising SchemaMismatch on shape drift.
+    """
+    lines = []
+    counter = [0]
+
+    def walk(var, node, path):
+        if type(node) is dict:
+            # Length guard plus direct key access catches both missing and
+            # extra keys relative to the sample
+            lines.append(f"  if len({var}) != {len(node)}: raise _mm")
+            for k, v in node.items():
+                if path == () and include_keys is not None and k not in include_keys:
+                    continue
+                child = path + (k,)
+                key = _JOIN(child)
+                if exclude_paths is not None and key in exclude_paths:
+                    continue
+                walk_value(f"{var}[{k!r}]", v, child)
+        else:
+            # List of dicts: guard the length, then descend per index
+            lines.append(f"  if len({var}) != {len(node)}: raise _mm")
+            for idx, item in enumerate(node):
+                walk_value(f"{var}[{idx}]", item, path + (str(idx),))
+
+    def walk_value(expr, v, path):
+        t = type(v)
+        if t is dict or (t is list and _all_dicts(v) and v):
+            name = f"n{counter[0]}"
+            counter[0] += 1
+            lines.append(f"  {name} = {expr}")
+            walk(name, v, path)
+        elif t is list:
+            if not v:
+                # Generic flatten drops empty lists entirely; any non-empty
+                # value here means the shape changed
+                lines.append(f"  if len({expr}) != 0: raise _mm")
+            else:
+                lines.append(f"  out[{_JOIN(path)!r}] = _pl({expr})")
+        else:
+            lines.append(f"  out[{_JOIN(path)!r}] = _lf({expr})")
+
+    def _all_dicts(x):
+        for item in x:
+            if type(item) is not dict:
+                return False
+        return True
+
+    walk("e", sample, ())
 
+    body = "\n".join(lines) if lines else "  pass"
+    src = (
+        "def _f(e):\n"
+        " out = {}\n"
+        " try:\n"
+        f"{body}\n"
+        " except (KeyError, IndexError, TypeError, AttributeError):\n"
+        "  raise _mm\n"
+        " return out\n"
+    )
 
+    fn = _SPECIALIZER_CACHE.get(src)
+    if fn is None:
+        ns = {"_lf": _check_leaf, "_pl": _check_plain_list, "_mm": SchemaMismatch}
+        exec(src, ns)
+        fn = _SPECIALIZER_CACHE[src] = ns["_f"]
+    return fn
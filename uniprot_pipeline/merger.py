@@ -1,7 +1,22 @@
+import os
 import pandas as pd
 from pathlib import Path
 from typing import Literal, Optional
 
+# orjson serializes rows much faster than the pandas json writer; fall back
+# to DataFrame.to_json when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Arrow's JSON reader tokenizes in parallel and lands directly in columnar
+# memory, far faster than pd.read_json on wide UniProt files; optional.
+try:
+    import pyarrow.json as paj
+except ImportError:
+    paj = None
+
 """
    # Merge JSONL files
 python -m uniprot_pipeline.merger \
@@ -24,6 +39,11 @@ def read_file(path: str, file_format: str) -> pd.DataFrame:
     if file_format == "json":
         return pd.read_json(path)
     elif file_format == "jsonl":
+        if paj is not None:
+            table = paj.read_json(path)
+            # split_blocks + self_destruct hand the Arrow buffers to pandas
+            # without an extra copy of the whole table
+            return table.to_pandas(split_blocks=True, self_destruct=True)
         return pd.read_json(path, lines=True)
     else:
         raise ValueError(f"Unsupported file format: {file_format}")
@@ -33,25 +53,172 @@ def write_file(df: pd.DataFrame, path: str, file_format: str):
     """Write DataFrame to file in specified format."""
     Path(path).parent.mkdir(parents=True, exist_ok=True)
     if file_format == "json":
-        df.to_json(path, orient="records", indent=2)
+        if orjson is not None:
+            records = df.to_dict(orient="records")
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2, default=str))
+        else:
+            df.to_json(path, orient="records", indent=2)
     elif file_format == "jsonl":
-        df.to_json(path, orient="records", lines=True)
+        if orjson is not None:
+            records = df.to_dict(orient="records")
+            with open(path, "wb") as f:
+                f.write(b"\n".join(orjson.dumps(row, default=str) for row in records) + b"\n")
+        else:
+            df.to_json(path, orient="records", lines=True)
     else:
         raise ValueError(f"Unsupported file format: {file_format}")
     print(f"Save Merged file: {path}")
 
 
-def merge_incremental_data(
+def merge_jsonl_streaming(
     old_path: str,
-    new_path: str,
+    new_path: Optional[str],
     output_path: str,
     id_column: str = "primaryAccession",
     sort_by: str = "entryAudit.lastAnnotationUpdateDate",
-    file_format: Literal["json", "jsonl"] = "jsonl") -> pd.DataFrame:
+    new_records=None):
+
+    """
+    Merge two JSONL files in a single streaming pass without pandas.
+
+    Keeps the entry with the latest sort_by value per id_column. Since the
+    UniProt dates are ISO-8601 strings, plain string comparison is enough
+    and no datetime parsing is needed. The decision pass parses only the
+    two key fields per line and remembers byte offsets rather than line
+    contents, so peak memory is a small tuple per unique accession; the
+    surviving raw lines are then copied to the output by seeking back
+    into the inputs.
+
+    Args:
+        old_path (str): Path to existing JSONL file (can be missing).
+        new_path (str): Path to new JSONL file (or None when new_records is given).
+        output_path (str): Where to save merged JSONL file.
+        id_column (str): Field used to identify duplicates.
+        sort_by (str): Field whose latest value wins for duplicate ids.
+        new_records: In-memory records to merge instead of reading new_path,
+            so callers that already hold the rows skip a disk round-trip.
+    """
+
+    import json as _json
+    loads = orjson.loads if orjson is not None else _json.loads
+    if orjson is not None:
+        dumps = lambda row: orjson.dumps(row, default=str) + b"\n"
+    else:
+        dumps = lambda row: (_json.dumps(row, default=str) + "\n").encode()
+
+    # id -> (sort value, path, offset-or-line, length); later sources win on
+    # a strictly newer sort value, so ties keep the existing (old) entry.
+    # In-memory records use path=None and carry their serialized line bytes.
+    best = {}
+    passthrough = []
+    total = 0
+    with_id = 0
+
+    def consume_records(rows):
+        nonlocal total, with_id
+        for row in rows:
+            total += 1
+            row_id = row.get(id_column)
+            if row_id is None:
+                passthrough.append((None, dumps(row), 0))
+                continue
+            with_id += 1
+            sort_val = str(row.get(sort_by) or "")
+            current = best.get(row_id)
+            if current is None or sort_val > current[0]:
+                best[row_id] = (sort_val, None, dumps(row), 0)
+
+    def consume(path):
+        nonlocal total, with_id
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                length = len(line)
+                start = offset
+                offset += length
+                if not line.strip():
+                    continue
+                total += 1
+                row = loads(line)
+                row_id = row.get(id_column)
+                if row_id is None:
+                    # Keep lines without an id rather than dropping them
+                    passthrough.append((path, start, length))
+                    continue
+                with_id += 1
+                sort_val = row.get(sort_by) or ""
+                current = best.get(row_id)
+                if current is None or sort_val > current[0]:
+                    best[row_id] = (sort_val, path, start, length)
+
+    if Path(old_path).exists():
+        print(f"[INFO] Loading old data from: {old_path}")
+        consume(old_path)
+    else:
+        print("No old data found")
+    if new_records is not None:
+        consume_records(new_records)
+    else:
+        consume(new_path)
+    print(f"Combined rows: {total}")
+
+    if total and not with_id:
+        raise ValueError(f"Missing required column: '{id_column}' in input files.")
+    if not best and not passthrough:
+        print("Merged result is empty after deduplication.")
+
+    # Newest first, matching the sorted DataFrame output
+    survivors = sorted(best.values(), key=lambda item: item[0], reverse=True)
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    # Write to a sibling temp file first so the output can safely overwrite
+    # one of the inputs we still need to read back from
+    tmp_path = f"{output_path}.tmp"
+    readers = {}
+    try:
+        def copy_line(path, start, length, out):
+            if path is None:
+                # In-memory record: start holds the serialized line
+                out.write(start)
+                return
+            reader = readers.get(path)
+            if reader is None:
+                reader = readers[path] = open(path, "rb")
+            reader.seek(start)
+            line = reader.read(length)
+            out.write(line if line.endswith(b"\n") else line + b"\n")
+
+        with open(tmp_path, "wb", buffering=1 << 20) as f:
+            for _, path, start, length in survivors:
+                copy_line(path, start, length, f)
+            for path, start, length in passthrough:
+                copy_line(path, start, length, f)
+    finally:
+        for reader in readers.values():
+            reader.close()
+    os.replace(tmp_path, output_path)
+    print(f"Save Merged file: {output_path}")
+
+
+def merge_incremental_data(
+    old_path: str,
+    new_path: Optional[str] = None,
+    output_path: str = None,
+    id_column: str = "primaryAccession",
+    sort_by: str = "entryAudit.lastAnnotationUpdateDate",
+    file_format: Literal["json", "jsonl"] = "jsonl",
+    new_records=None) -> Optional[pd.DataFrame]:
 
     """
     Merge existing and new UniProt data, remove duplicates, sort, and save to file.
 
+    JSONL input goes through the streaming single-pass merge; the DataFrame
+    path is kept for the small JSON array format. New data can come either
+    from a file (new_path) or directly from in-memory records
+    (new_records), which lets the pipeline skip a temp-file round-trip.
+
     Args:
         old_path (str): Path to existing data file (can be missing).
         new_path (str): Path to new data file.
@@ -59,15 +226,26 @@ def merge_incremental_data(
         id_column (str): Column used to identify duplicates.
         sort_by (str): Column used to sort entries.
         file_format (str): File format: 'json' or 'jsonl'.
+        new_records: In-memory new records, used instead of new_path.
 
     Returns:
-        pd.DataFrame: Final merged DataFrame.
+        pd.DataFrame or None: Final merged DataFrame ('json' format only).
     """
 
     # Load new data
-    if not Path(new_path).exists():
-        raise FileNotFoundError(f"New data file not found: {new_path}")
-    new_df = read_file(new_path, file_format)
+    if new_records is None:
+        if new_path is None:
+            raise ValueError("Either new_path or new_records must be provided.")
+        if not Path(new_path).exists():
+            raise FileNotFoundError(f"New data file not found: {new_path}")
+
+    if file_format == "jsonl":
+        merge_jsonl_streaming(old_path, new_path, output_path,
+                              id_column=id_column, sort_by=sort_by,
+                              new_records=new_records)
+        return None
+
+    new_df = pd.DataFrame(new_records) if new_records is not None else read_file(new_path, file_format)
 
     # Load old data if available
     if Path(old_path).exists():
@@ -4,6 +4,12 @@ from .downloader import uniprot_data
 from .merger import merge_incremental_data
 import json
 
+# orjson is faster than stdlib json; fall back when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def run_pipeline(
     mode: str,
@@ -15,7 +21,8 @@ def run_pipeline(
     exclude_sequence: bool = False,
     size: int = 500,
     file_format: str = "jsonl",
-    query: str = "organism_id:9606 AND reviewed:true"
+    query: str = "organism_id:9606 AND reviewed:true",
+    workers: int = None
 ):
     """
     Run the UniProt data pipeline in either bulk or incremental mode.
@@ -31,6 +38,7 @@ def run_pipeline(
         size (int): Number of entries per request
         file_format (str): 'json' or 'jsonl'
         query (str): UniProt API query
+        workers (int): Worker processes for flattening (None/1 = serial)
     """
 
     if mode not in {"bulk", "incremental"}:
@@ -44,7 +52,8 @@ def run_pipeline(
             output_json_path=output_json,
             flat_jsonl_path=output_jsonl,
             size=size,
-            exclude_sequence=exclude_sequence
+            exclude_sequence=exclude_sequence,
+            workers=workers
         )
         # Save metadata (for compare later)
         _log_and_write_metadata(headers, output_json, query)
@@ -55,23 +64,16 @@ def run_pipeline(
         if not from_date:
             raise ValueError("from_date must be provided in incremental mode.")
 
-        temp_path = make_temp_path(output_jsonl)
         print(f"Running INCREMENTAL import from {from_date} to {to_date or 'now'}:")
 
-        # records = uniprot_data(
-        #     query=query,
-        #     output_json_path=output_json,
-        #     flat_jsonl_path=temp_path,
-        #     size=size,
-        #     exclude_sequence=exclude_sequence
-        # )
-
-        records, headers = uniprot_data(  
+        # The filtered records are handed to the merge in memory, so no
+        # intermediate flattened JSONL is written
+        records, headers = uniprot_data(
             query=query,
             output_json_path=output_json,
-            flat_jsonl_path=temp_path,
             size=size,
-            exclude_sequence=exclude_sequence)
+            exclude_sequence=exclude_sequence,
+            workers=workers)
         
         # Save metadata (for compare later)
         _log_and_write_metadata(headers, output_json, query)
@@ -95,21 +97,25 @@ def run_pipeline(
 
         # df = pd.DataFrame(records)
 
-        # Ensure date columns are converted properly
-        for field in ["entryAudit.firstPublicDate", "entryAudit.lastAnnotationUpdateDate"]:
-            if field in df.columns:
-                df[field] = pd.to_datetime(df[field], errors="coerce")
-        
-        # Filter updates records 
-        filtered = df[df["entryAudit.lastAnnotationUpdateDate"] >= pd.to_datetime(from_date)]
+        # Parse only the date column the filter needs, pinning the ISO8601
+        # format so pandas takes the C fast path instead of per-cell format
+        # inference. The DataFrame itself keeps the original ISO strings.
+        from_ts = pd.Timestamp(from_date)
+        updated = pd.to_datetime(
+            df["entryAudit.lastAnnotationUpdateDate"], format="ISO8601", errors="coerce"
+        )
+
+        # Filter updates records
+        filtered = df[updated >= from_ts]
         print(f"[Filtered] Keeping {len(filtered)} updated rows since {from_date}")
 
         if filtered.empty:
             print("No matching records for incremental update. Skipping merge.")
             return
 
-        filtered.to_json(temp_path, orient="records", lines=True)
-        merge_incremental_data(base_jsonl, temp_path, output_jsonl, file_format=file_format)
+        merge_incremental_data(base_jsonl, output_path=output_jsonl,
+                               new_records=filtered.to_dict(orient="records"),
+                               file_format=file_format)
 
 
 #  ----------------------- Utility functions -----------------------
@@ -155,8 +161,12 @@ def _log_and_write_metadata(headers, output_json_path, query=None):
         metadata["query"] = query
     # Metadata dictionary is saved as a .json file right next to raw JSON output
     metadata_path = output_json_path.replace(".json", "_metadata.json")
-    with open(metadata_path, "w") as f:
-        json.dump(metadata, f, indent=2)
+    if orjson is not None:
+        with open(metadata_path, "wb") as f:
+            f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+    else:
+        with open(metadata_path, "w") as f:
+            json.dump(metadata, f, indent=2)
     print(f"Metadata saved to: {metadata_path}")
 
 